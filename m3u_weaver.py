@@ -6,30 +6,120 @@ M3U播放列表管理器
 """
 
 import os
+import posixpath
 import sys
+import select
 import termios
 import tty
+import unicodedata
+import time
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
+# JSON编解码：优先使用更快的orjson（可选依赖），否则回退到标准库json
+# _dumps返回UTF-8编码的bytes，indent为True时缩进2格
+try:
+    import orjson as _json
+
+    def _dumps(obj, indent=False):
+        return _json.dumps(obj, option=_json.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    import json as _json
+
+    def _dumps(obj, indent=False):
+        if indent:
+            return _json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return _json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+_loads = _json.loads
+
+
+def _truncate_display(text, limit=68):
+    """按终端显示宽度截断文本（东亚宽字符占两列），超出limit列时截断并以...结尾"""
+    # 每个字符最多占两列，足够短的文本无需逐字计算
+    if len(text) * 2 <= limit:
+        return text
+    widths = [2 if unicodedata.east_asian_width(c) in ('W', 'F') else 1 for c in text]
+    if sum(widths) <= limit:
+        return text
+    used = 0
+    for i, w in enumerate(widths):
+        if used + w > limit - 3:
+            return text[:i] + "..."
+        used += w
+    return text
+
+
+def _dumps_cache(obj):
+    """序列化扫描索引缓存（返回bytes）
+    
+    os.scandir对不是合法UTF-8的文件名（如旧ZIP包中的GBK文件名）会产生孤立代理字符，
+    orjson和UTF-8编码都无法处理；此时改用标准库json的ASCII转义，可以原样往返。
+    """
+    try:
+        return _dumps(obj)
+    except (TypeError, ValueError):
+        return json.dumps(obj, ensure_ascii=True, separators=(',', ':')).encode('ascii')
+
+
+def _loads_cache(data):
+    """解析扫描索引缓存，orjson不接受代理字符转义时回退到标准库json"""
+    try:
+        return _loads(data)
+    except ValueError:
+        return json.loads(data)
+
+# 路径分隔符标准化表：将反斜杠统一替换为正斜杠
+_SLASH_TAB = str.maketrans('\\', '/')
+
+# 支持的音乐文件后缀（小写），str.endswith可直接接受元组
+_EXT_TUPLE = ('.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma')
+
+# 扫描时默认跳过的目录名（小写），以.开头的隐藏目录总是跳过
+_DEFAULT_SKIP_DIRS = ('artwork', 'covers', '.trash', '__macosx')
+
+# 符号链接处理：指向文件的链接按其目标判断（与Path.is_file一致），目录链接不进入
+_FOLLOW_FILE_SYMLINKS = True
+_FOLLOW_DIR_SYMLINKS = False
+
+# 扫描索引缓存格式版本，缓存结构或扫描规则的含义变化时递增
+_CACHE_VERSION = 2
+
+# 目录mtime与记录时间相差不足此值（纳秒）时不信任缓存，下次重新读取。
+# FAT/exFAT等文件系统的时间戳精度为2秒，同一时间刻度内新增的文件不会改变目录mtime
+_RACY_NS = 2 * 10**9
+
 
 class ConfigManager:
     """配置管理器"""
     
     def __init__(self):
         self.config_file = Path("music_config.json")
+        self.cache_file = Path("music_index.cache")
         self.default_config = {
             "music_dir": "~/Music/音乐",
-            "page_size": 20
+            "page_size": 20,
+            # 扫描时跳过的目录名（不区分大小写），以.开头的隐藏目录总是跳过
+            "skip_dirs": list(_DEFAULT_SKIP_DIRS)
         }
+        # 常见音乐目录位置（"浏览常见位置"时使用）
+        user = os.getenv('USER')
+        self.common_paths = [
+            f"/Users/{user}/Music",
+            f"/Users/{user}/Desktop/Music",
+            "/Users/Shared/Music",
+            "自定义路径"
+        ]
+        self._common_paths_exist = None  # 常见目录是否存在的缓存，None表示需要重新检查
     
     def load_config(self):
         """加载配置文件"""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = _loads(f.read())
                 return {**self.default_config, **config}
             except Exception as e:
                 print(f"配置文件读取失败：{e}")
@@ -39,13 +129,56 @@ class ConfigManager:
     def save_config(self, config):
         """保存配置文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            # 先序列化，成功后再打开文件，避免序列化失败时清空原配置
+            data = _dumps(config, indent=True)
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
             return True
         except Exception as e:
             print(f"配置文件保存失败：{e}")
             return False
     
+    def get_skip_dirs(self, config):
+        """从配置中取出扫描时跳过的目录名，格式不正确时使用默认值"""
+        skip_dirs = config.get("skip_dirs")
+        if isinstance(skip_dirs, list) and all(isinstance(d, str) for d in skip_dirs):
+            return skip_dirs
+        print("配置项 skip_dirs 应为字符串列表，已使用默认值")
+        return list(_DEFAULT_SKIP_DIRS)
+    
+    def load_cache(self, music_dir):
+        """加载指定音乐目录的扫描索引缓存条目"""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    cache = _loads_cache(f.read())
+                return cache.get(str(music_dir), {})
+            except Exception as e:
+                print(f"索引缓存读取失败：{e}")
+        return {}
+    
+    def save_cache(self, music_dir, entry):
+        """保存指定音乐目录的扫描索引缓存条目（保留其他目录的缓存）"""
+        cache = {}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    cache = _loads_cache(f.read())
+            except Exception:
+                cache = {}
+        cache[str(music_dir)] = entry
+        try:
+            # 先序列化并写入临时文件，成功后再替换，失败时原缓存（包括其他目录的条目）保持不变
+            data = _dumps_cache(cache)
+            tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+            return True
+        except Exception as e:
+            print(f"索引缓存保存失败：{e}")
+            return False
+    
     def get_music_dir_interactive(self):
         """交互式获取音乐目录"""
         print("配置音乐目录")
@@ -69,23 +202,21 @@ class ConfigManager:
                 return self.default_config["music_dir"]
                 
             elif choice == '3':
-                common_paths = [
-                    f"/Users/{os.getenv('USER')}/Music",
-                    f"/Users/{os.getenv('USER')}/Desktop/Music",
-                    "/Users/Shared/Music",
-                    "自定义路径"
-                ]
+                common_paths = self.common_paths
+                if self._common_paths_exist is None:
+                    self._common_paths_exist = {p: Path(p).exists() for p in common_paths[:-1]}
+                path_exists = self._common_paths_exist
                 
                 print("\n常见音乐目录：")
                 for i, path in enumerate(common_paths, 1):
-                    exists = "✓" if path != "自定义路径" and Path(path).exists() else "✗"
+                    exists = "✓" if path_exists.get(path) else "✗"
                     print(f"{i}. {path} [{exists}]")
                 
                 try:
                     sub_choice = int(input(f"请选择 (1-{len(common_paths)}): "))
                     if 1 <= sub_choice <= len(common_paths) - 1:
                         selected_path = common_paths[sub_choice - 1]
-                        if Path(selected_path).exists():
+                        if path_exists[selected_path]:
                             return selected_path
                         else:
                             print("所选路径不存在")
@@ -97,6 +228,8 @@ class ConfigManager:
                             print("路径不存在")
                 except ValueError:
                     print("请输入有效数字")
+                # 浏览未能选定目录，下次浏览时重新检查目录是否存在
+                self._common_paths_exist = None
             else:
                 print("请选择 1-3")
 
@@ -104,7 +237,7 @@ class ConfigManager:
 class MusicPlaylistManager:
     """音乐播放列表管理器"""
     
-    def __init__(self, music_dir=None, page_size=20):
+    def __init__(self, music_dir=None, page_size=20, config_manager=None, rescan=False, skip_dirs=None, jobs=1):
         # 设置音乐目录
         if music_dir:
             self.music_dir = Path(music_dir)
@@ -112,66 +245,115 @@ class MusicPlaylistManager:
             self.music_dir = Path("/Users/song/Music/音乐")  # 默认路径作为后备
             
         self.music_files = []  # 存储所有音乐文件路径
-        self.selected_files = set()  # 存储选中的文件索引
+        self._music_posix = []  # 与music_files对应的标准化路径（用于播放列表比对）
+        self._music_names = []  # 与music_files对应的文件名（用于搜索和显示）
+        self._music_names_lower = []  # 小写文件名（用于搜索）
+        self._display_name = []  # 截断后的显示文件名
+        self.selected_files = bytearray(0)  # 选中标记位图，下标为文件索引，1表示选中
+        self._selected_count = 0  # 已选中的文件数量
         self.current_index = 0  # 当前光标位置
         self.page_size = page_size  # 每页显示的歌曲数量
         self.current_page = 0  # 当前页码
         self.screen_initialized = False  # 屏幕是否已初始化
+        self._old_termios = None  # 进入cbreak模式前的终端设置
+        self._last_rendered = []  # 上一次绘制的各行内容（用于增量重绘）
+        self._dirty = True  # 是否需要整页重绘
+        self._rendered_page = None  # 上一次绘制的页码
+        self._total_pages = 1  # 当前模式下的总页数
         self.existing_playlist = set()  # 现有播放列表中的歌曲（用于去重）
         self.append_mode = False  # 是否为追加模式
         self.target_playlist_file = None  # 目标播放列表文件
+        self._playlist_fd = None  # 追加模式下预先打开的目标播放列表文件描述符
         self.search_mode = False  # 是否在搜索模式
         self.search_keyword = ""  # 搜索关键词
         self.filtered_files = []  # 搜索结果（存储原始索引）
+        self._search_matcher = None  # 多关键词匹配函数缓存：(关键词元组, 函数)
+        self.config_manager = config_manager  # 用于读写扫描索引缓存，为None时不使用缓存
+        self.rescan = rescan  # 是否忽略缓存强制完整扫描
+        # 扫描时跳过的目录名（小写）
+        if skip_dirs is None:
+            skip_dirs = _DEFAULT_SKIP_DIRS
+        self.skip_dirs = frozenset(d.lower() for d in skip_dirs)
+        # 扫描目录的并发线程数，0表示自动选择
+        self.jobs = jobs if jobs != 0 else min(8, os.cpu_count() or 1)
+        self._index = {}  # 扫描索引：目录路径 -> (mtime, 音乐文件列表, 子目录列表, 记录时间)
+        self._index_changed = False  # 扫描索引是否需要写回缓存
         
-        # 支持的音乐文件格式
-        self.music_extensions = {'.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma'}
+        # 支持的音乐文件格式（扫描时直接使用_EXT_TUPLE匹配）
+        self.music_extensions = frozenset(_EXT_TUPLE)
         
     def getch(self):
-        """获取单个按键输入（macOS/Linux）"""
+        """获取单个按键输入（macOS/Linux，终端已由init_screen切换到cbreak模式）"""
+        # 直接读取文件描述符，避免sys.stdin的缓冲区使select判断失效
         fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setcbreak(fd)  # 使用setcbreak而不是cbreak
-            ch = sys.stdin.read(1)
-            # 处理方向键（ESC序列）
-            if ch == '\x1b':  # ESC
-                ch += sys.stdin.read(2)
-            return ch
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        ch = os.read(fd, 1)
+        # 处理方向键（ESC序列）：ESC后短时间内没有后续字节则视为单独的ESC键
+        if ch == b'\x1b' and select.select([fd], [], [], 0.02)[0]:
+            ch += os.read(fd, 1)
+            if ch == b'\x1b[':
+                # CSI序列：读取到结束字节（0x40-0x7E）为止，如PgUp的 ESC [ 5 ~
+                while True:
+                    b = os.read(fd, 1)
+                    ch += b
+                    if not b or 0x40 <= b[0] <= 0x7e:
+                        break
+            elif ch == b'\x1bO':
+                # SS3序列（应用光标模式下的方向键，如 ESC O A）：再读一个字节，
+                # 方向键统一转换为CSI形式，与普通方向键使用同一处理分支
+                ch += os.read(fd, 1)
+                if ch[2:] in (b'A', b'B', b'C', b'D'):
+                    ch = b'\x1b[' + ch[2:]
+        elif ch and ch[0] >= 0xc0:
+            # UTF-8多字节字符：根据首字节读取剩余的后续字节后再解码
+            remaining = 1 if ch[0] < 0xe0 else 2 if ch[0] < 0xf0 else 3
+            while remaining:
+                b = os.read(fd, remaining)
+                if not b:
+                    break
+                ch += b
+                remaining -= len(b)
+        return ch.decode('utf-8', 'ignore')
     
+    # 以下终端控制方法只返回转义序列，由调用方合并后一次性写出
     def clear_screen(self):
         """清屏"""
-        print("\033[2J", end="")
+        return "\033[2J"
         
     def move_cursor(self, row, col=1):
         """移动光标到指定位置"""
-        print(f"\033[{row};{col}H", end="")
+        return f"\033[{row};{col}H"
         
     def hide_cursor(self):
         """隐藏光标"""
-        print("\033[?25l", end="")
+        return "\033[?25l"
         
     def show_cursor(self):
         """显示光标"""
-        print("\033[?25h", end="")
+        return "\033[?25h"
         
     def clear_line(self):
         """清除当前行"""
-        print("\033[K", end="")
+        return "\033[K"
         
     def init_screen(self):
         """初始化屏幕"""
         if not self.screen_initialized:
-            self.clear_screen()
-            self.hide_cursor()
+            # 进入cbreak模式，直到cleanup_screen时才恢复，避免每次按键都设置终端
+            fd = sys.stdin.fileno()
+            self._old_termios = termios.tcgetattr(fd)
+            tty.setcbreak(fd)  # 使用setcbreak而不是cbreak
+            # 写入缓冲区，随第一帧一起刷新
+            sys.stdout.write(self.clear_screen() + self.hide_cursor())
             self.screen_initialized = True
+            self._dirty = True
     
     def cleanup_screen(self):
         """清理屏幕设置"""
-        self.show_cursor()
-        print()  # 换行
+        # 恢复终端设置（可重复调用）
+        if self._old_termios is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._old_termios)
+            self._old_termios = None
+        print(self.show_cursor())  # 显示光标并换行
     
     def scan_music_files(self):
         """扫描音乐目录，获取所有音乐文件"""
@@ -182,48 +364,205 @@ class MusicPlaylistManager:
             print(f"错误：音乐目录不存在：{self.music_dir}")
             return False
             
-        # 递归扫描所有音乐文件
-        for file_path in self.music_dir.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.music_extensions:
-                # 使用相对路径，避免绝对路径过长
-                relative_path = file_path.relative_to(self.music_dir.parent)
-                self.music_files.append(str(relative_path))
+        # 递归扫描所有音乐文件，未变化的目录直接使用缓存结果
+        # 缓存生成时的格式或扫描规则与当前不一致时，忽略整个缓存
+        cache = {}
+        if self.config_manager and not self.rescan:
+            entry = self.config_manager.load_cache(self.music_dir)
+            rules = self._cache_rules()
+            if isinstance(entry, dict) and all(entry.get(k) == v for k, v in rules.items()):
+                cache = entry.get("dirs", {})
+        self.music_files = self._walk(os.fspath(self.music_dir), cache)
         
         self.music_files.sort()  # 按文件名排序
+        
+        # 预先计算标准化路径和文件名，避免每次刷新界面时构造Path对象
+        self._music_posix = [p.translate(_SLASH_TAB) for p in self.music_files]
+        self._music_names = [os.path.basename(p) for p in self.music_files]
+        self._music_names_lower = [n.lower() for n in self._music_names]
+        # 文件名过长时按显示宽度截断，避免中文等宽字符折行
+        self._display_name = [_truncate_display(n) for n in self._music_names]
+        self.selected_files = bytearray(len(self.music_files))
+        self._selected_count = 0
+        self._recompute_pages()
         print(f"找到 {len(self.music_files)} 个音乐文件")
         return len(self.music_files) > 0
     
+    def _scan_dir(self, path, base):
+        """读取单个目录，返回(音乐文件相对路径列表, 子目录路径列表)"""
+        files = []
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                # 直接对文件名做后缀检查，避免构造Path对象和切片出后缀
+                # 普通文件的类型信息来自readdir，只有符号链接才会额外stat
+                if entry.name.lower().endswith(_EXT_TUPLE) and entry.is_file(follow_symlinks=_FOLLOW_FILE_SYMLINKS):
+                    files.append(os.path.relpath(entry.path, base))
+                elif entry.is_dir(follow_symlinks=_FOLLOW_DIR_SYMLINKS):
+                    subdirs.append(entry.path)
+        return files, subdirs
+    
+    def _cache_rules(self):
+        """返回扫描索引缓存的格式和扫描规则标识，不一致时缓存失效"""
+        return {
+            "version": _CACHE_VERSION,
+            "exts": list(_EXT_TUPLE),
+            "follow_file_symlinks": _FOLLOW_FILE_SYMLINKS,
+            "follow_dir_symlinks": _FOLLOW_DIR_SYMLINKS,
+        }
+    
+    def _visit_dir(self, path, base, cache):
+        """处理单个目录，返回(mtime, 音乐文件列表, 子目录列表, 记录时间, 是否重新读取)，无法读取时返回None"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            cached = cache.get(path)
+            # 与git处理"racy"索引项相同：mtime与记录时间过于接近的缓存不可信
+            if cached is not None and cached[0] == mtime and cached[3] - mtime >= _RACY_NS:
+                return mtime, cached[1], cached[2], cached[3], False
+            files, subdirs = self._scan_dir(path, base)
+            # 记录时间取在读取目录之后，之后的任何修改都会被下次扫描发现
+            return mtime, files, subdirs, int(time.time() * 10**9), True
+        except OSError:
+            # 无权限等无法读取的目录直接跳过
+            return None
+    
+    def _walk(self, root, cache=None):
+        """使用os.scandir遍历目录树，返回音乐文件相对路径列表
+        
+        cache为上次扫描的索引。目录的mtime只在其直接子项增删改名时变化，
+        因此mtime未变的目录沿用缓存的文件和子目录列表，只需一次stat，
+        但仍会继续检查其子目录。mtime距记录时间不足_RACY_NS的目录总是重新读取。
+        隐藏目录和skip_dirs中的目录不会进入。
+        jobs大于1时使用线程池并发读取目录（仅适合网络或USB等高延迟存储，本地磁盘上反而更慢）。
+        """
+        cache = cache or {}
+        # 使用相对路径，避免绝对路径过长
+        base = os.fspath(self.music_dir.parent)
+        index = {}
+        changed = False
+        found = []
+        
+        def record(path, result):
+            """记录一个目录的扫描结果，返回需要继续进入的子目录"""
+            nonlocal changed
+            mtime, files, subdirs, recorded, rescanned = result
+            changed = changed or rescanned
+            index[path] = (mtime, files, subdirs, recorded)
+            found.extend(files)
+            # 跳过隐藏目录和配置中排除的目录（缓存中保留完整子目录列表，排除规则变化时无需重新扫描）
+            return [
+                sub for sub in subdirs
+                if not os.path.basename(sub).startswith('.')
+                and os.path.basename(sub).lower() not in self.skip_dirs
+            ]
+        
+        if self.jobs <= 1:
+            stack = [root]
+            while stack:
+                d = stack.pop()
+                result = self._visit_dir(d, base, cache)
+                if result is not None:
+                    stack.extend(record(d, result))
+        else:
+            # os.scandir/os.stat期间会释放GIL，多个目录的读取可以并发进行
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                pending = {pool.submit(self._visit_dir, root, base, cache): root}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        d = pending.pop(future)
+                        result = future.result()
+                        if result is not None:
+                            for sub in record(d, result):
+                                pending[pool.submit(self._visit_dir, sub, base, cache)] = sub
+        
+        self._index = index
+        self._index_changed = changed or len(index) != len(cache)
+        return found
+    
+    def save_index(self):
+        """将扫描索引写回缓存文件（仅在有变化时）"""
+        if self.config_manager and self._index_changed:
+            entry = {**self._cache_rules(), "dirs": self._index}
+            if self.config_manager.save_cache(self.music_dir, entry):
+                self._index_changed = False
+    
     def load_existing_playlist(self, playlist_file):
         """加载现有的.m3u播放列表"""
         try:
-            playlist_path = Path(playlist_file)
-            if not playlist_path.exists():
+            if not os.path.exists(playlist_file):
                 return False, f"播放列表文件不存在：{playlist_file}"
             
-            self.existing_playlist.clear()
-            with open(playlist_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # 标准化路径格式，确保一致性
-                    normalized_path = str(Path(line).as_posix())
-                    self.existing_playlist.add(normalized_path)
+            # 预先打开追加用的文件描述符，保存时直接写入
+            fd = os.open(playlist_file, os.O_WRONLY | os.O_APPEND)
+            try:
+                # 逐行读取文件，不保留完整的行列表
+                with open(playlist_file, 'r', encoding='utf-8') as f:
+                    stripped = (ln.strip() for ln in f)
+                    # 标准化路径分隔符，并去掉开头的./、合并重复的/，确保与扫描结果一致
+                    # （每次加载只执行一次，不在界面刷新的热路径上）
+                    self.existing_playlist = {
+                        posixpath.normpath(ln.translate(_SLASH_TAB))
+                        for ln in stripped
+                        if ln and not ln.startswith('#')
+                    }
+            except Exception:
+                os.close(fd)
+                raise
             
+            self.close_playlist()
+            self._playlist_fd = fd
             self.target_playlist_file = playlist_file
             self.append_mode = True
+            self._dirty = True
             return True, f"成功加载播放列表：{playlist_file}，包含 {len(self.existing_playlist)} 首歌曲"
             
         except Exception as e:
             return False, f"加载播放列表时出错：{e}"
     
-    def is_song_in_playlist(self, file_path):
-        """检查歌曲是否已在播放列表中"""
+    def _playlist_append_fd(self):
+        """返回指向当前目标播放列表的追加文件描述符
+        
+        加载后文件可能被编辑器、播放器或同步工具以重命名方式替换，
+        此时原描述符指向已脱离路径的旧文件，需要按文件名重新打开。
+        文件已被删除时os.stat抛出异常，不会重新创建。
+        """
+        st = os.stat(self.target_playlist_file)
+        if self._playlist_fd is not None:
+            fst = os.fstat(self._playlist_fd)
+            if (fst.st_dev, fst.st_ino) == (st.st_dev, st.st_ino):
+                return self._playlist_fd
+            self.close_playlist()
+        self._playlist_fd = os.open(self.target_playlist_file, os.O_WRONLY | os.O_APPEND)
+        return self._playlist_fd
+    
+    def close_playlist(self):
+        """关闭追加模式下预先打开的播放列表文件（可重复调用）"""
+        if self._playlist_fd is not None:
+            os.close(self._playlist_fd)
+            self._playlist_fd = None
+    
+    def is_song_in_playlist(self, idx):
+        """检查指定索引的歌曲是否已在播放列表中"""
         if not self.append_mode:
             return False
-        normalized_path = str(Path(file_path).as_posix())
-        return normalized_path in self.existing_playlist
+        return self._music_posix[idx] in self.existing_playlist
+    
+    def toggle_selected(self, idx):
+        """切换指定索引歌曲的选中状态"""
+        self.selected_files[idx] ^= 1
+        self._selected_count += 1 if self.selected_files[idx] else -1
+    
+    def get_selected_indices(self):
+        """按原顺序返回所有选中歌曲的索引"""
+        # 位图天然按索引有序，用bytearray.find跳过未选中的部分，无需逐字节循环或排序
+        indices = []
+        find = self.selected_files.find
+        i = find(1)
+        while i != -1:
+            indices.append(i)
+            i = find(1, i + 1)
+        return indices
     
     def get_available_playlists(self):
         """获取当前目录下的所有.m3u文件"""
@@ -238,20 +577,35 @@ class MusicPlaylistManager:
             self.filtered_files = []
             self.current_index = 0
             self.current_page = 0
+            self._dirty = True
+            self._recompute_pages()
             return
         
-        self.search_keyword = keyword.strip().lower()
-        self.filtered_files = []
+        self.search_keyword = kw = keyword.strip().lower()
+        tokens = tuple(kw.split())
         
-        # 搜索匹配的文件
-        for i, file_path in enumerate(self.music_files):
-            file_name = Path(file_path).name.lower()
-            if self.search_keyword in file_name:
-                self.filtered_files.append(i)
+        # 搜索匹配的文件（文件名已预先转为小写）
+        if len(tokens) == 1:
+            self.filtered_files = [i for i, n in enumerate(self._music_names_lower) if kw in n]
+        else:
+            # 多个关键词：文件名需包含所有关键词
+            match = self._get_search_matcher(tokens)
+            self.filtered_files = [i for i, n in enumerate(self._music_names_lower) if match(n)]
         
         self.search_mode = True
         self.current_index = 0
         self.current_page = 0
+        self._dirty = True
+        self._recompute_pages()
+    
+    def _get_search_matcher(self, tokens):
+        """为多个关键词生成匹配函数（相同关键词复用上次生成的函数）"""
+        if self._search_matcher is None or self._search_matcher[0] != tokens:
+            # 生成形如 lambda n: 'a' in n and 'b' in n 的函数，避免逐个关键词循环
+            # 关键词经repr转为字符串字面量，不会被当作代码执行
+            src = 'lambda n: ' + ' and '.join(f'{t!r} in n' for t in tokens)
+            self._search_matcher = (tokens, eval(src, {'__builtins__': {}}))
+        return self._search_matcher[1]
     
     def clear_search(self):
         """清除搜索"""
@@ -260,145 +614,132 @@ class MusicPlaylistManager:
         self.filtered_files = []
         self.current_index = 0
         self.current_page = 0
+        self._dirty = True
+        self._recompute_pages()
+    
+    def _recompute_pages(self):
+        """根据当前模式重新计算总页数（文件列表或搜索结果变化时调用）"""
+        total_items = len(self.filtered_files if self.search_mode else self.music_files)
+        self._total_pages = max(1, (total_items + self.page_size - 1) // self.page_size)
     
     def get_current_display_files(self):
         """获取当前要显示的文件列表（考虑搜索模式）"""
         if self.search_mode:
             return self.filtered_files
         else:
-            return list(range(len(self.music_files)))
+            # 直接返回range对象（支持索引和len），避免每次分配新列表
+            return range(len(self.music_files))
     
-    def get_current_page_items(self):
-        """获取当前页的项目"""
+    def get_current_page_indices(self):
+        """获取当前页项目在music_files中的索引（显示所需的数据均按索引从缓存列表读取）"""
+        start_idx = self.current_page * self.page_size
         if self.search_mode:
             # 搜索模式：返回搜索结果的当前页
-            start_idx = self.current_page * self.page_size
-            end_idx = min(start_idx + self.page_size, len(self.filtered_files))
-            page_indices = self.filtered_files[start_idx:end_idx]
-            page_items = [self.music_files[i] for i in page_indices]
-            return page_items, page_indices
+            return self.filtered_files[start_idx:start_idx + self.page_size]
         else:
             # 正常模式：返回所有文件的当前页
-            start_idx = self.current_page * self.page_size
             end_idx = min(start_idx + self.page_size, len(self.music_files))
-            page_items = self.music_files[start_idx:end_idx]
-            page_indices = list(range(start_idx, end_idx))
-            return page_items, page_indices
+            return range(start_idx, end_idx)
     
     def display_page(self):
-        """显示当前页面"""
+        """显示当前页面（只重绘内容发生变化的行）"""
         # 初始化屏幕（只在第一次调用时清屏）
         self.init_screen()
         
-        page_items, page_indices = self.get_current_page_items()
+        # 界面模式、页码或屏幕状态变化时，整页重绘
+        if self._dirty or self._rendered_page != self.current_page:
+            self._last_rendered = []
+            self._rendered_page = self.current_page
+            self._dirty = False
         
-        # 计算总页数（根据当前模式）
-        if self.search_mode:
-            total_items = len(self.filtered_files)
-        else:
-            total_items = len(self.music_files)
-        total_pages = (total_items + self.page_size - 1) // self.page_size if total_items > 0 else 1
+        page_indices = self.get_current_page_indices()
         
-        # 移动到屏幕顶部并显示标题信息
-        self.move_cursor(1)
-        self.clear_line()
-        print("=" * 80)
+        total_pages = self._total_pages
         
-        self.move_cursor(2)
-        self.clear_line()
+        # 先构建整页内容，每个元素对应屏幕上的一行（从第1行开始）
+        lines = []
+        
+        # 标题信息
+        lines.append("=" * 80)
         mode_text = "追加模式" if self.append_mode else "新建模式"
         target_info = f" -> {self.target_playlist_file}" if self.append_mode else ""
         search_info = f" [搜索: {self.search_keyword}]" if self.search_mode else ""
-        print(f"M3U播放列表管理器 ({mode_text}) - 第 {self.current_page + 1}/{total_pages} 页{target_info}{search_info}")
+        lines.append(f"M3U播放列表管理器 ({mode_text}) - 第 {self.current_page + 1}/{total_pages} 页{target_info}{search_info}")
         
-        self.move_cursor(3)
-        self.clear_line()
         existing_count = len(self.existing_playlist) if self.append_mode else 0
         if self.search_mode:
-            print(f"搜索到 {len(self.filtered_files)} 首歌曲，已选择 {len(self.selected_files)} 首，播放列表中已有 {existing_count} 首")
+            lines.append(f"搜索到 {len(self.filtered_files)} 首歌曲，已选择 {self._selected_count} 首，播放列表中已有 {existing_count} 首")
         else:
-            print(f"总共 {len(self.music_files)} 首歌曲，已选择 {len(self.selected_files)} 首，播放列表中已有 {existing_count} 首")
-        
-        self.move_cursor(4)
-        self.clear_line()
-        print("=" * 80)
+            lines.append(f"总共 {len(self.music_files)} 首歌曲，已选择 {self._selected_count} 首，播放列表中已有 {existing_count} 首")
+        lines.append("=" * 80)
         
-        self.move_cursor(5)
-        self.clear_line()
         if self.search_mode:
-            print("操作说明：↑↓移动光标 | 空格选择/取消 | ←→翻页 | Esc清除搜索 | S保存 | Q退出")
+            lines.append("操作说明：↑↓移动光标 | 空格选择/取消 | ←→翻页 | Esc清除搜索 | S保存 | Q退出")
         else:
-            print("操作说明：↑↓移动光标 | 空格选择/取消 | ←→翻页 | /搜索 | A追加到现有 | S保存 | Q退出")
+            lines.append("操作说明：↑↓移动光标 | 空格选择/取消 | ←→翻页 | /搜索 | A追加到现有 | S保存 | Q退出")
+        lines.append("=" * 80)
         
-        self.move_cursor(6)
-        self.clear_line()
-        print("=" * 80)
-        
-        self.move_cursor(7)
-        self.clear_line()
         if self.append_mode:
-            print("符号说明：▶当前选中 | ✓新选择 | ●已在播放列表中 | ○已在列表且新选择")
+            lines.append("符号说明：▶当前选中 | ✓新选择 | ●已在播放列表中 | ○已在列表且新选择")
         else:
-            print("符号说明：▶当前选中 | ✓已选择的歌曲")
-        
-        self.move_cursor(8)
-        self.clear_line()
-        print("=" * 80)
+            lines.append("符号说明：▶当前选中 | ✓已选择的歌曲")
+        lines.append("=" * 80)
         
-        # 显示当前页的音乐文件
+        # 当前页的音乐文件
         for i in range(self.page_size):
-            row = 9 + i
-            self.move_cursor(row)
-            self.clear_line()
+            if i >= len(page_indices):
+                lines.append("")
+                continue
             
-            if i < len(page_items):
-                file_path = page_items[i]
-                global_idx = page_indices[i]  # 使用新的索引系统
-                
-                # 在搜索模式下，current_index是相对于搜索结果的索引
-                if self.search_mode:
-                    display_idx = self.current_page * self.page_size + i
-                    cursor = "▶ " if display_idx == self.current_index else "  "
-                else:
-                    cursor = "▶ " if global_idx == self.current_index else "  "
-                
-                # 确定状态符号
-                is_selected = global_idx in self.selected_files
-                is_in_playlist = self.is_song_in_playlist(file_path)
-                
-                if self.append_mode:
-                    if is_in_playlist and is_selected:
-                        checkbox = "○ "  # 已在播放列表中且新选择
-                    elif is_in_playlist:
-                        checkbox = "● "  # 已在播放列表中
-                    elif is_selected:
-                        checkbox = "✓ "  # 新选择
-                    else:
-                        checkbox = "  "
+            global_idx = page_indices[i]  # 使用新的索引系统
+            
+            # 在搜索模式下，current_index是相对于搜索结果的索引
+            if self.search_mode:
+                display_idx = self.current_page * self.page_size + i
+                cursor = "▶ " if display_idx == self.current_index else "  "
+            else:
+                cursor = "▶ " if global_idx == self.current_index else "  "
+            
+            # 确定状态符号
+            is_selected = self.selected_files[global_idx]
+            is_in_playlist = self.is_song_in_playlist(global_idx)
+            
+            if self.append_mode:
+                if is_in_playlist and is_selected:
+                    checkbox = "○ "  # 已在播放列表中且新选择
+                elif is_in_playlist:
+                    checkbox = "● "  # 已在播放列表中
+                elif is_selected:
+                    checkbox = "✓ "  # 新选择
                 else:
-                    checkbox = "✓ " if is_selected else "  "
-                
-                # 获取文件名（不包含路径）
-                file_name = Path(file_path).name
-                
-                # 如果文件名过长，截断显示
-                if len(file_name) > 68:
-                    file_name = file_name[:65] + "..."
-                
-                print(f"{cursor}{checkbox}{file_name}")
-        
-        # 显示页面导航信息
-        footer_row = 9 + self.page_size
-        self.move_cursor(footer_row)
-        self.clear_line()
-        print("=" * 80)
+                    checkbox = "  "
+            else:
+                checkbox = "✓ " if is_selected else "  "
+            
+            # 文件名（不包含路径，已预先截断）
+            lines.append(f"{cursor}{checkbox}{self._display_name[global_idx]}")
         
-        self.move_cursor(footer_row + 1)
-        self.clear_line()
+        # 页面导航信息
+        lines.append("=" * 80)
         if total_pages > 1:
-            print(f"使用 ←→ / PgUp/PgDn / Enter 翻页 (当前第 {self.current_page + 1}/{total_pages} 页)")
+            lines.append(f"使用 ←→ / PgUp/PgDn / Enter 翻页 (当前第 {self.current_page + 1}/{total_pages} 页)")
+        else:
+            lines.append("")
         
-        # 刷新输出
+        # 与上一帧逐行比较，只输出变化的行，并合并为一次写入
+        last = self._last_rendered
+        clear = self.clear_line()
+        buf = []
+        prev_changed = False
+        for i, line in enumerate(lines):
+            changed = i >= len(last) or last[i] != line
+            # 上一行过长折行时会覆盖本行，因此上一行重绘后本行也一并重绘
+            if changed or prev_changed:
+                buf.append(f"{self.move_cursor(i + 1)}{clear}{line}")
+            prev_changed = changed
+        self._last_rendered = lines
+        
+        sys.stdout.write(''.join(buf))
         sys.stdout.flush()
     
     def handle_input(self):
@@ -437,16 +778,10 @@ class MusicPlaylistManager:
                     # 搜索模式下，需要获取真实的文件索引
                     if self.current_index < len(self.filtered_files):
                         real_idx = self.filtered_files[self.current_index]
-                        if real_idx in self.selected_files:
-                            self.selected_files.remove(real_idx)
-                        else:
-                            self.selected_files.add(real_idx)
+                        self.toggle_selected(real_idx)
                 else:
                     # 正常模式
-                    if self.current_index in self.selected_files:
-                        self.selected_files.remove(self.current_index)
-                    else:
-                        self.selected_files.add(self.current_index)
+                    self.toggle_selected(self.current_index)
                     
             elif key == '\x1b[A':  # 上方向键
                 if self.current_index > 0:
@@ -466,18 +801,10 @@ class MusicPlaylistManager:
                     self.current_index += 1
                     # 如果光标移到了下一页，自动翻页
                     if self.current_index >= (self.current_page + 1) * self.page_size:
-                        if self.search_mode:
-                            total_pages = (len(self.filtered_files) + self.page_size - 1) // self.page_size
-                        else:
-                            total_pages = (len(self.music_files) + self.page_size - 1) // self.page_size
-                        self.current_page = min(total_pages - 1, self.current_page + 1)
+                        self.current_page = min(self._total_pages - 1, self.current_page + 1)
                         
             elif key == '\r' or key == '\n':  # Enter键翻页
-                if self.search_mode:
-                    total_pages = (len(self.filtered_files) + self.page_size - 1) // self.page_size
-                else:
-                    total_pages = (len(self.music_files) + self.page_size - 1) // self.page_size
-                self.current_page = (self.current_page + 1) % total_pages
+                self.current_page = (self.current_page + 1) % self._total_pages
                 # 调整光标位置到当前页
                 self.current_index = self.current_page * self.page_size
                 
@@ -487,11 +814,7 @@ class MusicPlaylistManager:
                     self.current_index = self.current_page * self.page_size
                     
             elif key == '\x1b[6~':  # Page Down
-                if self.search_mode:
-                    total_pages = (len(self.filtered_files) + self.page_size - 1) // self.page_size
-                else:
-                    total_pages = (len(self.music_files) + self.page_size - 1) // self.page_size
-                if self.current_page < total_pages - 1:
+                if self.current_page < self._total_pages - 1:
                     self.current_page += 1
                     self.current_index = self.current_page * self.page_size
                     
@@ -501,11 +824,7 @@ class MusicPlaylistManager:
                     self.current_index = self.current_page * self.page_size
                     
             elif key == '\x1b[C':  # 右方向键 - 下一页
-                if self.search_mode:
-                    total_pages = (len(self.filtered_files) + self.page_size - 1) // self.page_size
-                else:
-                    total_pages = (len(self.music_files) + self.page_size - 1) // self.page_size
-                if self.current_page < total_pages - 1:
+                if self.current_page < self._total_pages - 1:
                     self.current_page += 1
                     self.current_index = self.current_page * self.page_size
     
@@ -581,12 +900,16 @@ class MusicPlaylistManager:
         # 重新初始化屏幕
         self.screen_initialized = False
     
+    def _playlist_line(self, file_path):
+        """生成写入播放列表的一行（使用相对路径，避免&nbsp等HTML实体）"""
+        return f"{file_path.replace('&nbsp;', ' ').replace('&amp;', '&')}\n"
+    
     def save_playlist(self):
         """保存选中的音乐到.m3u文件"""
         # 清理屏幕显示，切换到正常模式
         self.cleanup_screen()
         
-        if not self.selected_files:
+        if not self._selected_count:
             print("没有选择任何歌曲，无法生成播放列表。")
             input("按任意键继续...")
             return False
@@ -596,11 +919,10 @@ class MusicPlaylistManager:
             new_songs = []
             duplicate_count = 0
             
-            selected_indices = sorted(self.selected_files)
+            selected_indices = self.get_selected_indices()
             for idx in selected_indices:
-                file_path = self.music_files[idx]
-                if not self.is_song_in_playlist(file_path):
-                    new_songs.append(file_path)
+                if not self.is_song_in_playlist(idx):
+                    new_songs.append(self.music_files[idx])
                 else:
                     duplicate_count += 1
             
@@ -620,11 +942,11 @@ class MusicPlaylistManager:
                 return False
             
             try:
-                # 追加新歌曲到现有文件
-                with open(self.target_playlist_file, 'a', encoding='utf-8') as f:
-                    for file_path in new_songs:
-                        clean_path = file_path.replace('&nbsp;', ' ').replace('&amp;', '&')
-                        f.write(f"{clean_path}\n")
+                # 追加新歌曲到现有文件，合并为一次写入（使用加载时打开的文件描述符）
+                fd = self._playlist_append_fd()
+                data = memoryview(''.join(self._playlist_line(p) for p in new_songs).encode('utf-8'))
+                while data:
+                    data = data[os.write(fd, data):]
                 
                 print(f"成功添加 {len(new_songs)} 首歌曲到 {self.target_playlist_file}")
             
@@ -635,7 +957,7 @@ class MusicPlaylistManager:
         
         else:
             # 新建模式：创建新的播放列表文件
-            print(f"已选择 {len(self.selected_files)} 首歌曲")
+            print(f"已选择 {self._selected_count} 首歌曲")
             playlist_name = input("请输入播放列表名称（不需要.m3u后缀）: ").strip()
             
             if not playlist_name:
@@ -646,17 +968,11 @@ class MusicPlaylistManager:
             playlist_file = f"{playlist_name}.m3u"
             
             try:
-                with open(playlist_file, 'w', encoding='utf-8') as f:
-                    f.write("#EXTM3U\n")  # M3U文件头
-                    
-                    # 按原顺序写入选中的歌曲
-                    selected_indices = sorted(self.selected_files)
-                    for idx in selected_indices:
-                        file_path = self.music_files[idx]
-                        # 写入文件路径，使用相对路径
-                        # 避免&nbsp等HTML实体
-                        clean_path = file_path.replace('&nbsp;', ' ').replace('&amp;', '&')
-                        f.write(f"{clean_path}\n")
+                # 按原顺序写入选中的歌曲，M3U文件头和所有路径合并为一次写入
+                selected_indices = self.get_selected_indices()
+                buf = "#EXTM3U\n" + ''.join(self._playlist_line(self.music_files[idx]) for idx in selected_indices)
+                with open(playlist_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write(buf)
                 
                 print(f"播放列表已保存到: {playlist_file}")
                 print(f"包含 {len(selected_indices)} 首歌曲")
@@ -675,17 +991,32 @@ class MusicPlaylistManager:
         print("=" * 40)
         
         # 扫描音乐文件
-        if not self.scan_music_files():
-            print("没有找到音乐文件，程序退出。")
-            return
+        found = self.scan_music_files()
         
         # 开始交互
         try:
+            if not found:
+                print("没有找到音乐文件，程序退出。")
+                return
             self.handle_input()
         finally:
             # 确保程序结束时清理屏幕
             if self.screen_initialized:
                 self.cleanup_screen()
+            # 保存本次扫描的索引，供下次启动增量扫描
+            self.save_index()
+            self.close_playlist()
+
+
+def non_negative_int(value):
+    """argparse类型：非负整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的整数：{value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数：{value}")
+    return number
 
 
 def parse_arguments():
@@ -699,6 +1030,8 @@ def parse_arguments():
   python3 m3u_weaver.py -d /path/to/music         # 指定音乐目录
   python3 m3u_weaver.py --config                  # 交互式配置音乐目录
   python3 m3u_weaver.py -d ~/Music --page-size 30 # 自定义目录和页面大小
+  python3 m3u_weaver.py --rescan                  # 忽略缓存，完整重新扫描
+  python3 m3u_weaver.py --jobs 8                  # 使用8个线程扫描网络驱动器上的音乐库
         """
     )
     
@@ -727,18 +1060,31 @@ def parse_arguments():
         help='重置配置文件为默认值'
     )
     
+    parser.add_argument(
+        '--jobs',
+        default=1,
+        type=non_negative_int,
+        help='扫描目录的并发线程数，0表示自动。仅对网络或USB等高延迟存储有效，'
+             '在本地磁盘上会比单线程更慢 (默认: 1)'
+    )
+    
+    parser.add_argument(
+        '--rescan',
+        action='store_true',
+        help='忽略扫描缓存，完整重新扫描音乐目录'
+    )
+    
     return parser.parse_args()
 
 
-def get_music_directory(args):
-    """获取音乐目录路径"""
-    config_manager = ConfigManager()
+def get_music_directory(args, config_manager):
+    """获取音乐目录路径，返回(音乐目录, 本次使用的配置)"""
     
     # 如果用户要求重置配置
     if args.reset_config:
         config_manager.save_config(config_manager.default_config)
         print("配置已重置为默认值")
-        return config_manager.default_config["music_dir"]
+        return config_manager.default_config["music_dir"], config_manager.default_config
     
     # 如果指定了命令行参数
     if args.music_dir:
@@ -749,7 +1095,7 @@ def get_music_directory(args):
             config["music_dir"] = str(music_dir)
             config["page_size"] = args.page_size
             config_manager.save_config(config)
-            return str(music_dir)
+            return str(music_dir), config
         else:
             print(f"错误：指定的音乐目录不存在：{music_dir}")
             sys.exit(1)
@@ -763,7 +1109,7 @@ def get_music_directory(args):
             config["page_size"] = args.page_size
             config_manager.save_config(config)
             print(f"配置已保存：{music_dir}")
-            return music_dir
+            return music_dir, config
     
     # 加载现有配置
     config = config_manager.load_config()
@@ -783,7 +1129,7 @@ def get_music_directory(args):
             if new_dir:
                 config["music_dir"] = new_dir
                 config_manager.save_config(config)
-                return new_dir
+                return new_dir, config
             else:
                 sys.exit(1)
         elif choice == '2':
@@ -792,7 +1138,7 @@ def get_music_directory(args):
         else:
             sys.exit(1)
     
-    return str(music_dir)
+    return str(music_dir), config
 
 
 def main():
@@ -803,9 +1149,10 @@ def main():
     # 解析命令行参数
     args = parse_arguments()
     
-    # 获取音乐目录
+    # 获取音乐目录（配置只加载一次，后续直接复用）
+    config_manager = ConfigManager()
     try:
-        music_dir = get_music_directory(args)
+        music_dir, config = get_music_directory(args, config_manager)
     except KeyboardInterrupt:
         print("\n用户取消操作")
         sys.exit(0)
@@ -813,7 +1160,14 @@ def main():
     # 创建管理器实例并运行
     manager = None
     try:
-        manager = MusicPlaylistManager(music_dir=music_dir, page_size=args.page_size)
+        manager = MusicPlaylistManager(
+            music_dir=music_dir,
+            page_size=args.page_size,
+            config_manager=config_manager,
+            rescan=args.rescan,
+            skip_dirs=config_manager.get_skip_dirs(config),
+            jobs=args.jobs
+        )
         manager.run()
     except KeyboardInterrupt:
         if manager and manager.screen_initialized: